@@ -1,18 +1,190 @@
 #!/usr/bin/env python
 from setuptools import setup, find_packages
 from setuptools.extension import Extension
+from setuptools.command.build_ext import build_ext
+from Cython.Build import cythonize
+from distutils.ccompiler import new_compiler
+from distutils.errors import CompileError, DistutilsPlatformError, \
+    LinkError
+from distutils.sysconfig import customize_compiler
 import numpy as np
 import glob
+import os
+import subprocess
+import sys
+import sysconfig
+import tempfile
 
 scripts = glob.glob("scripts/*")
 
-cython_extensions = [
-    Extension("soxs.lib.broaden_lines",
-              ["soxs/lib/broaden_lines.pyx"],
-              language="c", libraries=["m"],
-              include_dirs=[np.get_include()])
+# The prange loops only run in parallel if SOXS_OPENMP=1 is set for the
+# build. OpenMP runtimes such as libgomp do not survive fork(), which is
+# how multiprocessing starts workers on Linux by default, so a threaded
+# build is not the default.
+use_openmp = os.environ.get("SOXS_OPENMP", "0") not in ("", "0")
+
+# Fast-math modes are avoided on every compiler, since they also let
+# it assume there are no NaNs or infinities
+if sys.platform == "win32":
+    # MSVC has no finer-grained switches than /fp:fast
+    extra_compile_args = ["/O2", "/fp:precise"]
+    openmp_args = ["/openmp"]
+else:
+    # The individual flags are used instead of -ffast-math
+    extra_compile_args = ["-O3", "-fno-math-errno", "-fno-trapping-math",
+                          "-fno-signed-zeros", "-freciprocal-math",
+                          "-fassociative-math", "-funroll-loops",
+                          "-ftree-vectorize"]
+    # Apple's clang does not ship OpenMP, in which case the
+    # prange loops in broaden_lines simply run serially
+    openmp_args = [] if sys.platform == "darwin" else ["-fopenmp"]
+
+
+def check_openmp(args):
+    """
+    Check whether the C compiler can build and link a
+    program using OpenMP with these arguments.
+    """
+    compiler = new_compiler()
+    customize_compiler(compiler)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = os.path.join(tmpdir, "check_openmp.c")
+        with open(src, "w") as f:
+            f.write("#include <omp.h>\n"
+                    "int main(void) { return omp_get_max_threads() < 1; }\n")
+        try:
+            objs = compiler.compile([src], output_dir=tmpdir,
+                                    extra_postargs=args)
+            compiler.link_executable(objs, os.path.join(tmpdir, "check_openmp"),
+                                     extra_postargs=args)
+        except (CompileError, LinkError):
+            return False
+    return True
+
+
+# Since the extensions are optional, an OpenMP flag the compiler rejects
+# (e.g. clang without libomp) would quietly leave only the pure-Python
+# versions, so the flags are tried out first
+if use_openmp and openmp_args and not check_openmp(openmp_args):
+    print("The C compiler does not support OpenMP, so the extensions "
+          "will be built without it.", file=sys.stderr)
+    use_openmp = False
+if not use_openmp:
+    openmp_args = []
+
+# On x86-64, broaden_lines is also built for AVX2 and AVX-512 hosts.
+# soxs.lib picks the best variant the CPU supports at import time.
+isa_variants = {"generic": []}
+build_platform = sysconfig.get_platform()
+if build_platform.startswith("macosx") and build_platform.endswith("arm64"):
+    # Every Apple Silicon CPU implements at least the M1 feature set
+    isa_variants["generic"] = ["-mcpu=apple-m1"]
+elif build_platform.endswith(("x86_64", "amd64")):
+    if sys.platform == "win32":
+        isa_variants["avx2"] = ["/arch:AVX2"]
+        isa_variants["avx512"] = ["/arch:AVX512"]
+    else:
+        isa_variants["avx2"] = ["-mavx2", "-mfma"]
+        isa_variants["avx512"] = ["-mavx512f", "-mavx512dq", "-mavx2", "-mfma"]
+
+cython_directives = {"language_level": 3, "boundscheck": False,
+                     "wraparound": False, "cdivision": True,
+                     "initializedcheck": False}
+
+# The extensions are optional: if they fail to compile, SOXS falls
+# back to pure-Python versions of broaden_lines and sample_cdf
+ext_kwargs = {"language": "c",
+              "define_macros": [("NPY_NO_DEPRECATED_API",
+                                 "NPY_1_7_API_VERSION")],
+              "extra_link_args": openmp_args,
+              "optional": True}
+
+broaden_lines_extensions = [
+    Extension(f"soxs.lib.broaden_lines_{variant}",
+              [f"soxs/lib/broaden_lines_{variant}.pyx"],
+              libraries=["m"],
+              include_dirs=[np.get_include(), "soxs/lib"],
+              extra_compile_args=extra_compile_args+openmp_args+isa_args,
+              **ext_kwargs)
+    for variant, isa_args in isa_variants.items()
 ]
 
+# If MKL is available, also build a version of broaden_lines which
+# evaluates erf with MKL's vector math library
+if "MKLROOT" in os.environ:
+    mkl_lib_dir = os.path.join(os.environ["MKLROOT"], "lib")
+    broaden_lines_extensions.append(
+        Extension("soxs.lib.broaden_lines_mkl",
+                  ["soxs/lib/broaden_lines_mkl.pyx"],
+                  libraries=["mkl_rt"],
+                  include_dirs=[np.get_include(),
+                                os.path.join(os.environ["MKLROOT"], "include")],
+                  library_dirs=[mkl_lib_dir],
+                  runtime_library_dirs=[] if sys.platform == "win32"
+                  else [mkl_lib_dir],
+                  extra_compile_args=extra_compile_args+openmp_args,
+                  **ext_kwargs)
+    )
+
+sample_cdf_extension = Extension("soxs.lib.sample_cdf",
+                                 ["soxs/lib/sample_cdf.pyx"],
+                                 include_dirs=[np.get_include()],
+                                 extra_compile_args=extra_compile_args+openmp_args,
+                                 **ext_kwargs)
+
+cython_extensions = cythonize(broaden_lines_extensions+[sample_cdf_extension],
+                              compiler_directives=cython_directives)
+
+pgo_dir = os.environ.get("SOXS_PGO_DIR",
+                         os.path.join(tempfile.gettempdir(), "soxs-pgo"))
+
+
+class build_ext_pgo_generate(build_ext):
+    """
+    Build the extensions instrumented to write profiles to
+    SOXS_PGO_DIR for profile-guided optimization.
+    """
+    pgo_args = [f"-fprofile-generate={pgo_dir}"]
+
+    def check_compiler(self):
+        # The profile flags and file format are GCC's. Clang accepts the
+        # flags but needs its profiles merged with llvm-profdata first.
+        if self.compiler.compiler_type == "unix":
+            out = subprocess.run([self.compiler.compiler_so[0], "--version"],
+                                 capture_output=True, text=True).stdout
+            if "clang" not in out.lower():
+                return
+        raise DistutilsPlatformError("Profile-guided builds of SOXS "
+                                     "require GCC.")
+
+    def build_extensions(self):
+        self.check_compiler()
+        for ext in self.extensions:
+            ext.extra_compile_args = ext.extra_compile_args + self.pgo_args
+            ext.extra_link_args = ext.extra_link_args + self.pgo_args
+            # Do not fall back to the pure-Python kernels quietly
+            ext.optional = False
+        self.force = True
+        super().build_extensions()
+
+
+class build_ext_pgo_use(build_ext_pgo_generate):
+    """
+    Build the extensions using the profiles written by a
+    training run of a build_ext_pgo_generate build.
+    """
+    pgo_args = [f"-fprofile-use={pgo_dir}", "-fprofile-correction"]
+
+    def build_extensions(self):
+        if not glob.glob(os.path.join(pgo_dir, "**", "*.gcda"),
+                         recursive=True):
+            raise DistutilsPlatformError(f"No profiles were found in "
+                                         f"{pgo_dir}. Build with "
+                                         f"build_ext_pgo_generate and run "
+                                         f"it first.")
+        super().build_extensions()
+
+
 VERSION = "3.4.0"
 
 setup(name='soxs',
@@ -22,7 +194,6 @@ setup(name='soxs',
       author='John ZuHone',
       author_email='john.zuhone@cfa.harvard.edu',
       url='https://github.com/lynx-x-ray-observatory/soxs/',
-      setup_requires=["numpy", "cython>=0.24"],
       install_requires=["numpy", "astropy>=3.0", "tqdm", "pooch",
                         "h5py", "scipy", "pyyaml", "regions", "appdirs"],
       include_package_data=True,
@@ -34,4 +205,6 @@ setup(name='soxs',
           'Topic :: Scientific/Engineering :: Visualization',
       ],
       ext_modules=cython_extensions,
+      cmdclass={"build_ext_pgo_generate": build_ext_pgo_generate,
+                "build_ext_pgo_use": build_ext_pgo_use},
       )
@@ -4,7 +4,7 @@ import os
 from soxs.utils import parse_value, mylog, soxs_cfg, \
     DummyPbar, get_data_file
 from tqdm.auto import tqdm
-from soxs.lib.broaden_lines import broaden_lines
+from soxs.lib import broaden_lines
 from soxs.constants import erg_per_keV, hc, \
     cosmic_elem, metal_elem, atomic_weights, clight, \
     m_u, elem_names, abund_tables
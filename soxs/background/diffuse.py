@@ -93,7 +93,7 @@ def generate_channel_spectrum(count_rate, t_exp, solid_angle, prng=None):
         The exposure time in seconds.
     solid_angle : float, (value, unit) tuple, or :class:`~astropy.units.Quantity`
         The solid angle in arcmin**2.
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
@@ -97,7 +97,7 @@ def generate_sources(fov, sky_center, prng=None):
         The field of view in arcminutes.
     sky_center : array-like
         The center RA, Dec of the field of view in degrees.
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
@@ -154,7 +154,7 @@ def make_ptsrc_background(exp_time, fov, sky_center, absorb_model=None,
     diffuse_unresolved : boolean, optional
         Add a diffuse component across the entire field of view to represent
         the unresolved flux from sources at very small fluxes. Default: True
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
@@ -347,7 +347,7 @@ def make_point_sources_file(filename, name, exp_time, fov,
     diffuse_unresolved : boolean, optional
         Add a diffuse component across the entire field of view to represent
         the unresolved flux from sources at very small fluxes. Default: True
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
@@ -383,7 +383,7 @@ def make_point_source_list(output_file, fov, sky_center, prng=None):
         The field of view in arcminutes.
     sky_center : array-like
         The center RA, Dec of the field of view in degrees.
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
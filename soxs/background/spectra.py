@@ -1,6 +1,6 @@
 import numpy as np
 from soxs.spectra import Spectrum, ConvolvedSpectrum, \
-    _generate_energies, Energies
+    _generate_energies, _sum_interpolated_area, Energies
 from soxs.constants import erg_per_keV
 from soxs.utils import parse_prng, parse_value
 from soxs.response import AuxiliaryResponseFile
@@ -50,7 +50,7 @@ class BackgroundSpectrum(Spectrum):
         fov : float, (value, unit) tuple, or :class:`~astropy.units.Quantity`
             The width of the field of view on a side in 
             arcminutes.
-        prng : :class:`~numpy.random.RandomState` object, integer, or None
+        prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
             A pseudo-random number generator. Typically will only 
             be specified if you have a reason to generate the same 
             set of random numbers, such as for a test. Default is None, 
@@ -66,7 +66,7 @@ class BackgroundSpectrum(Spectrum):
         prng = parse_prng(prng)
         rate = area*fov*fov*self.total_flux.value
         energy = _generate_energies(self, t_exp, rate, prng, quiet=quiet)
-        flux = np.sum(energy)*erg_per_keV/t_exp/area
+        flux = energy.sum()*(erg_per_keV/(t_exp*area))
         energies = Energies(energy, flux)
         return energies
 
@@ -120,7 +120,7 @@ class ConvolvedBackgroundSpectrum(ConvolvedSpectrum):
         fov : float, (value, unit) tuple, or :class:`~astropy.units.Quantity`
             The width of the field of view on a side 
             in arcminutes.
-        prng : :class:`~numpy.random.RandomState` object, integer, or None
+        prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
             A pseudo-random number generator. Typically will only 
             be specified if you have a reason to generate the same 
             set of random numbers, such as for a test. Default is None, 
@@ -135,7 +135,7 @@ class ConvolvedBackgroundSpectrum(ConvolvedSpectrum):
         prng = parse_prng(prng)
         rate = fov*fov*self.total_flux.value
         energy = _generate_energies(self, t_exp, rate, prng, quiet=quiet)
-        earea = self.arf.interpolate_area(energy).value
-        flux = np.sum(energy)*erg_per_keV/t_exp/earea.sum()
+        earea_sum = _sum_interpolated_area(self.arf, energy)
+        flux = energy.sum()*(erg_per_keV/(t_exp*earea_sum))
         energies = Energies(energy, flux)
         return energies
@@ -90,7 +90,7 @@ def make_cosmological_sources(exp_time, fov, sky_center, cat_center=None,
         If set to a filename, output circle ds9 regions corresponding to the
         positions of the halos with radii corresponding to their R500 
         projected on the sky.  Default: None
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
@@ -297,7 +297,7 @@ def make_cosmological_sources_file(filename, name, exp_time, fov,
         If set, this will be the filename to write the source
         to. By default, the source will be written to the same
         file as the SIMPUT catalog
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
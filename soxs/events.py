@@ -240,7 +240,7 @@ def make_exposure_map(event_file, expmap_file, energy, weights=None,
         asphist = exp_time*np.ones((1,1))
 
     # Determine the effective area
-    eff_area = arf.interpolate_area(energy).value
+    eff_area = arf._interpolate_area_raw(energy)
     if weights is not None:
         eff_area = np.average(eff_area, weights=weights)
 
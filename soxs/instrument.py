@@ -80,7 +80,7 @@ def generate_events(source, exp_time, instrument, sky_center,
         A two-float array-like object which shifts the aimpoint on the 
         detector from the nominal position. Units are in arcseconds.
         Default: None, which results in no shift from the nominal aimpoint. 
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
@@ -359,7 +359,7 @@ def make_background(exp_time, instrument, sky_center, foreground=True,
         A two-float array-like object which shifts the aimpoint on the 
         detector from the nominal position. Units are in arcseconds.
         Default: None, which results in no shift from the nominal aimpoint. 
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
@@ -511,7 +511,7 @@ def make_background_file(out_file, exp_time, instrument, sky_center,
         If set to a filename, input the point source positions, fluxes,
         and spectral indices from an ASCII table instead of generating
         them. Default: None
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
@@ -618,7 +618,7 @@ def instrument_simulator(input_events, out_file, exp_time, instrument,
         If set to a filename, input the point source positions, fluxes,
         and spectral indices from an ASCII table instead of generating
         them. Default: None
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
@@ -703,7 +703,7 @@ def simulate_spectrum(spec, instrument, exp_time, out_file,
         are turned on. 
     overwrite : boolean, optional
         Whether or not to overwrite an existing file. Default: False
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
@@ -0,0 +1,100 @@
+import functools
+import importlib
+import subprocess
+import sys
+import numpy as np
+
+
+_isa_requirements = [
+    ("avx512", {"avx512f", "avx512dq", "avx2", "fma"}),
+    ("avx2", {"avx2", "fma"}),
+]
+
+
+def _cpu_features():
+    """
+    Return the set of (lowercase) instruction set extensions
+    supported by this CPU, or an empty set if they cannot be
+    determined.
+    """
+    features = set()
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/cpuinfo", "r") as f:
+                for line in f:
+                    if line.startswith("flags"):
+                        features.update(line.split(":", 1)[1].split())
+                        break
+        elif sys.platform == "darwin":
+            out = subprocess.run(["sysctl", "-n", "machdep.cpu.features",
+                                  "machdep.cpu.leaf7_features"],
+                                 capture_output=True, text=True).stdout
+            features.update(out.lower().split())
+        elif sys.platform == "win32":
+            import ctypes
+            present = ctypes.windll.kernel32.IsProcessorFeaturePresent
+            # PF_AVX2_INSTRUCTIONS_AVAILABLE implies FMA support,
+            # PF_AVX512F_INSTRUCTIONS_AVAILABLE is only reported
+            # if the OS saves the AVX-512 register state
+            if present(40):
+                features.update({"avx2", "fma"})
+            if present(41):
+                features.update({"avx512f", "avx512dq"})
+    except Exception:
+        pass
+    return features
+
+
+def _contiguous_args(kernel):
+    # The compiled kernels take C-contiguous arrays of a single
+    # floating-point type, while the old build and the pure-Python
+    # version accept any float64 arrays, strided ones included
+    @functools.wraps(kernel)
+    def broaden_lines(E0, sigma, amp, ebins):
+        args = [np.asarray(a) for a in (E0, sigma, amp, ebins)]
+        if all(a.dtype == np.float32 for a in args):
+            dtype = np.float32
+        else:
+            dtype = np.float64
+        return kernel(*[np.ascontiguousarray(a, dtype=dtype) for a in args])
+    return broaden_lines
+
+
+def _load_broaden_lines():
+    features = _cpu_features()
+    variants = [variant for variant, needs in _isa_requirements
+                if needs <= features]
+    # The MKL build is only present if SOXS was built against MKL
+    variants.insert(0, "mkl")
+    for variant in variants + ["generic"]:
+        try:
+            mod = importlib.import_module(f"soxs.lib.broaden_lines_{variant}")
+        except ImportError:
+            continue
+        return _contiguous_args(mod.broaden_lines)
+    from soxs.utils import mylog
+    mylog.warning("No compiled build of broaden_lines is available, so "
+                  "line broadening will use the slower pure-Python version.")
+    from soxs.lib.broaden_lines_python import broaden_lines
+    return broaden_lines
+
+
+broaden_lines = _load_broaden_lines()
+# Importing the soxs.lib.broaden_lines module sets the attribute of the
+# same name here to the module, so the function is taken back from it
+from soxs.lib.broaden_lines import broaden_lines  # noqa: E402
+
+
+def _load_sample_cdf():
+    try:
+        from soxs.lib.sample_cdf import sample_cdf
+    except ImportError:
+        from soxs.utils import mylog
+        mylog.warning("No compiled build of sample_cdf is available, so "
+                      "photon energies will be drawn with the slower "
+                      "pure-Python version.")
+        from soxs.lib.sample_cdf_python import sample_cdf
+    return sample_cdf
+
+
+sample_cdf = _load_sample_cdf()
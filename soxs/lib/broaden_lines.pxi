@@ -0,0 +1,62 @@
+import numpy as np
+from cython.parallel cimport prange
+
+include "line_window.pxi"
+
+cdef extern from "vector_math.h":
+    double erf(double x) nogil
+    float erff(float x) nogil
+
+def broaden_lines(const real_t[::1] E0,
+                  const real_t[::1] sigma,
+                  const real_t[::1] amp,
+                  const real_t[::1] ebins):
+
+    cdef int i, j, k, n, m, b, b0, b1, lo, hi, nblocks
+    cdef real_t e0, isigma, a
+    cdef real_t half = 0.5, one = 1.0
+    cdef int[::1] jlo, jhi
+    cdef real_t[:, ::1] cdf
+    cdef real_t[::1] vec
+
+    if real_t is float:
+        dtype = np.float32
+    else:
+        dtype = np.float64
+
+    n = E0.shape[0]
+    m = ebins.shape[0]
+    nblocks = (m-2)//LINE_BLOCK + 1
+    jlo = np.empty(n, dtype=np.intc)
+    jhi = np.empty(n, dtype=np.intc)
+    cdf = np.empty((nblocks, LINE_BLOCK+1), dtype=dtype)
+    vec = np.zeros(m-1, dtype=dtype)
+
+    with nogil:
+        for i in range(n):
+            line_window(ebins, E0[i], sigma[i], &jlo[i], &jhi[i])
+        # Each thread owns whole blocks of bins and adds the lines to
+        # them in order, so there is one parallel region per call and
+        # the result does not depend on the number of threads
+        for b in prange(nblocks, schedule="dynamic"):
+            b0 = b*LINE_BLOCK
+            b1 = min(b0+LINE_BLOCK, m-1)
+            for i in range(n):
+                # Bin edges of this line's window that fall in the block
+                lo = max(jlo[i], b0)
+                hi = min(jhi[i], b1+1)
+                if hi-lo < 2:
+                    continue
+                e0 = E0[i]
+                isigma = one/sigma[i]
+                a = amp[i]
+                for j in range(lo, hi):
+                    k = j-b0
+                    if real_t is float:
+                        cdf[b, k] = half*(one+erff((ebins[j]-e0)*isigma))
+                    else:
+                        cdf[b, k] = half*(one+erf((ebins[j]-e0)*isigma))
+                for j in range(lo, hi-1):
+                    k = j-b0
+                    vec[j] = vec[j] + (cdf[b, k+1] - cdf[b, k])*a
+    return np.asarray(vec)
@@ -0,0 +1,3 @@
+# broaden_lines used to be built as this module. It is kept so that code
+# importing the function from here still gets the build soxs.lib picked.
+from soxs.lib import broaden_lines  # noqa: F401
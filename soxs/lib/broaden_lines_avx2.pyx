@@ -0,0 +1 @@
+include "broaden_lines.pxi"
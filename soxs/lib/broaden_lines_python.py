@@ -0,0 +1,18 @@
+import numpy as np
+from scipy.special import erf
+
+
+def broaden_lines(E0, sigma, amp, ebins):
+    """
+    Pure NumPy version of the compiled broaden_lines kernel,
+    used if no compiled build of it is available.
+    """
+    vec = np.zeros(ebins.size-1, dtype=ebins.dtype)
+    # Evaluate the lines in chunks to bound the size of the
+    # (lines, bins) temporaries
+    chunk = max(1, 1048576 // ebins.size)
+    for i in range(0, E0.size, chunk):
+        x = (ebins-E0[i:i+chunk,np.newaxis])/sigma[i:i+chunk,np.newaxis]
+        cdf = 0.5*(1.0+erf(x))
+        vec += np.dot(amp[i:i+chunk], np.diff(cdf, axis=1))
+    return vec
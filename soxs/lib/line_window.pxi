@@ -0,0 +1,29 @@
+ctypedef fused real_t:
+    float
+    double
+
+# Beyond this many widths from the line center erf(x) rounds to
+# exactly +/-1, so the line contributes nothing to those bins
+DEF LINE_WINDOW = 6.0
+
+# Number of bins handled together by one thread
+DEF LINE_BLOCK = 256
+
+cdef inline int searchsorted(const real_t[::1] a, real_t v) nogil:
+    # Index of the first element of the sorted array a which is >= v
+    cdef int lo = 0, hi = a.shape[0], mid
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if a[mid] < v:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+cdef inline void line_window(const real_t[::1] ebins, real_t e0,
+                             real_t sigma, int* jlo, int* jhi) nogil:
+    # Range [jlo, jhi) of bin edges over which the line has to be
+    # evaluated, padded by one edge on either side
+    jlo[0] = max(searchsorted(ebins, e0-LINE_WINDOW*sigma)-1, 0)
+    jhi[0] = min(searchsorted(ebins, e0+LINE_WINDOW*sigma)+1,
+                 ebins.shape[0])
@@ -0,0 +1,41 @@
+import numpy as np
+from cython.parallel cimport prange
+
+def sample_cdf(const double[::1] randvec,
+               const double[::1] cdf,
+               const double[::1] ebins,
+               const double[::1] slope,
+               const Py_ssize_t[::1] guide_lo,
+               const Py_ssize_t[::1] guide_hi,
+               double[::1] out=None):
+
+    cdef Py_ssize_t i, b, lo, hi, mid, n, size
+    cdef double x
+
+    n = randvec.shape[0]
+    size = guide_lo.shape[0]
+    if out is None:
+        out = np.empty(n)
+    elif out.shape[0] != n:
+        raise ValueError("out must have the same size as randvec!")
+
+    # The loop is only threaded in builds made with SOXS_OPENMP=1. Most
+    # photon energy draws come through here, so the default build keeps
+    # them safe in multiprocessing workers started with fork
+    with nogil:
+        for i in prange(n, schedule="static"):
+            x = randvec[i]
+            b = <Py_ssize_t>(x*size)
+            if b >= size:
+                b = size-1
+            # cdf[lo] <= x < cdf[hi], and hi == lo+1 for most buckets
+            lo = guide_lo[b]
+            hi = guide_hi[b]
+            while hi-lo > 1:
+                mid = (lo+hi)//2
+                if cdf[mid] <= x:
+                    lo = mid
+                else:
+                    hi = mid
+            out[i] = slope[lo]*(x-cdf[lo]) + ebins[lo]
+    return np.asarray(out)
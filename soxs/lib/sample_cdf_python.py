@@ -0,0 +1,23 @@
+import numpy as np
+
+
+def sample_cdf(randvec, cdf, ebins, slope, guide_lo, guide_hi, out=None):
+    """
+    Pure NumPy version of the compiled sample_cdf kernel,
+    used if no compiled build of it is available.
+    """
+    size = guide_lo.size
+    bucket = (randvec*size).astype(np.intp)
+    np.minimum(bucket, size-1, out=bucket)
+    lo = guide_lo[bucket]
+    # Each random number is in the CDF bin its bucket starts in or the
+    # next one, except for the rare buckets which span several bins,
+    # which are searched directly
+    wide = np.nonzero(guide_hi[bucket]-lo > 2)[0]
+    lo += cdf[lo+1] <= randvec
+    if wide.size > 0:
+        lo[wide] = np.searchsorted(cdf, randvec[wide], side="right")-1
+    out = np.subtract(randvec, cdf[lo], out=out)
+    out *= slope[lo]
+    out += ebins[lo]
+    return out
@@ -0,0 +1,18 @@
+#ifndef SOXS_VECTOR_MATH_H
+#define SOXS_VECTOR_MATH_H
+
+#include <math.h>
+
+/* glibc only declares the SIMD variants of its math functions (which
+   live in libmvec) when compiling with -ffast-math. Declare the ones we
+   need ourselves so GCC can vectorize the erf loops in broaden_lines
+   regardless of the floating-point flags in use. */
+#if defined(__x86_64__) && defined(__GLIBC__) && !defined(__FAST_MATH__) \
+    && defined(__GNUC__) && !defined(__clang__)
+#if __GLIBC_PREREQ(2, 35) && __GNUC__ >= 6
+__attribute__((__simd__("notinbranch"))) extern double erf(double);
+__attribute__((__simd__("notinbranch"))) extern float erff(float);
+#endif
+#endif
+
+#endif
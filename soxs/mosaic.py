@@ -60,7 +60,7 @@ def make_mosaic_events(pointing_list, input_source, out_prefix, exp_time,
         A two-float array-like object which shifts the aimpoint on the 
         detector from the nominal position. Units are in arcseconds.
         Default: None, which results in no shift from the nominal aimpoint. 
-    prng : :class:`~numpy.random.RandomState` object, integer, or None
+    prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
         A pseudo-random number generator. Typically will only 
         be specified if you have a reason to generate the same 
         set of random numbers, such as for a test. Default is None, 
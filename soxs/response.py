@@ -66,9 +66,79 @@ class AuxiliaryResponseFile:
         Interpolate the effective area to the energies 
         provided  by the supplied *energy* array.
         """
-        earea = np.interp(np.asarray(energy), self.emid, self.eff_area,
-                          left=0.0, right=0.0)
-        return u.Quantity(earea, "cm**2")
+        return u.Quantity(self._interpolate_area_raw(energy), "cm**2")
+
+    def _interpolate_area_raw(self, energy):
+        # Same as interpolate_area, but returns the area in cm**2 as a
+        # plain array for internal callers that only need the numbers
+        energy = np.asarray(energy)
+        grid = self._get_uniform_grid()
+        if grid and energy.size > 1000:
+            return self._interpolate_uniform(energy, grid)
+        return np.interp(energy, self.emid, self.eff_area,
+                         left=0.0, right=0.0)
+
+    def _snapshot(self):
+        return np.array(self.emid), np.array(self.eff_area)
+
+    def _is_current(self, snapshot):
+        # emid and eff_area are public and may be reassigned or edited
+        # in place, so cached tables remember what they were made from
+        return np.array_equal(snapshot[0], self.emid) and \
+            np.array_equal(snapshot[1], self.eff_area)
+
+    _uniform_grid = None
+
+    def _get_uniform_grid(self):
+        # Most ARFs are tabulated on a uniform energy grid. Then the
+        # interval an energy falls in can be predicted with a multiply
+        # and fixed up with a single comparison, instead of the binary
+        # search np.interp does for every point.
+        if self._uniform_grid is None or \
+                not self._is_current(self._uniform_grid[0]):
+            emid = np.asarray(self.emid, dtype="float64")
+            n = emid.size
+            grid = False
+            if n > 2 and emid[-1] > emid[0]:
+                de = (emid[-1]-emid[0])/(n-1)
+                offset = emid-(emid[0]+de*np.arange(n))
+                if np.abs(offset).max() < 0.25*de:
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        slope = np.diff(self.eff_area)/np.diff(emid)
+                    grid = (emid, 1.0/de, slope)
+            self._uniform_grid = (self._snapshot(), grid)
+        return self._uniform_grid[1]
+
+    def _interpolate_uniform(self, energy, grid):
+        emid, inv_de, slope = grid
+        n = emid.size
+        x = energy-emid[0]
+        j = (x*inv_de).astype(np.intp)
+        np.clip(j, 0, n-2, out=j)
+        # The predicted interval can be off by one near the knots
+        j -= energy < emid[j]
+        j += energy >= emid[j+1]
+        np.clip(j, 0, n-2, out=j)
+        x = energy-emid[j]
+        earea = slope[j]*x
+        earea += self.eff_area[j]
+        earea[(energy < emid[0]) | (energy > emid[-1])] = 0.0
+        return earea
+
+    _grid_area = None
+
+    def _interpolate_area_on_grid(self, emid):
+        # Spectra are usually convolved with the same ARF on the same
+        # energy grid again and again (e.g. once per source), so the
+        # area on the last grid is kept. The array returned is shared
+        # and must not be modified.
+        if self._grid_area is None or \
+                not np.array_equal(self._grid_area[1], emid) or \
+                not self._is_current(self._grid_area[0]):
+            earea = np.interp(emid, self.emid, self.eff_area,
+                              left=0.0, right=0.0)
+            self._grid_area = (self._snapshot(), np.array(emid), earea)
+        return self._grid_area[2]
 
     def detect_events_spec(self, src, exp_time, refband, prng=None):
         from soxs.spectra import ConvolvedSpectrum
@@ -104,7 +174,7 @@ class AuxiliaryResponseFile:
         refband : array_like
             A two-element array or list containing the limits 
             of the energy band which the flux was computed in. 
-        prng : :class:`~numpy.random.RandomState` object, integer, or None
+        prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
             A pseudo-random number generator. Typically will only 
             be specified if you have a reason to generate the same 
             set of random numbers, such as for a test. Default is None, 
@@ -114,7 +184,7 @@ class AuxiliaryResponseFile:
         energy = np.asarray(events["energy"])
         if energy.size == 0:
             return events
-        earea = self.interpolate_area(energy).value
+        earea = self._interpolate_area_raw(energy)
         idxs = np.logical_and(energy >= refband[0], energy <= refband[1])
         rate = flux/(energy[idxs].sum()*erg_per_keV)*earea[idxs].sum()
         n_ph = prng.poisson(lam=rate*exp_time)
@@ -325,7 +395,7 @@ class RedistributionMatrixFile:
         ----------
         events : dict of np.ndarrays
             The energies and positions of the photons. 
-        prng : :class:`~numpy.random.RandomState` object, integer, or None
+        prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
             A pseudo-random number generator. Typically will only 
             be specified if you have a reason to generate the same 
             set of random numbers, such as for a test. Default is None, 
@@ -503,7 +503,7 @@ class SimputPhotonList(SimputSource):
             events for a SIMPUT file, a constant should be 
             used and it must be large enough so that a 
             sufficiently large sample is drawn for the ARF.
-        prng : :class:`~numpy.random.RandomState` object, integer, or None
+        prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
             A pseudo-random number generator. Typically will only 
             be specified if you have a reason to generate the same 
             set of random numbers, such as for a test. Default is None, 
@@ -93,7 +93,7 @@ class SpatialModel:
         ----------
         num_events : integer
             The number of events to generate.
-        prng : :class:`~numpy.random.RandomState` object, integer, or None
+        prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
             A pseudo-random number generator. Typically will only
             be specified if you have a reason to generate the same
             set of random numbers, such as for a test. Default is None,
@@ -3,61 +3,181 @@ import subprocess
 import tempfile
 import shutil
 import os
+from bisect import bisect_left
 from soxs.utils import soxs_files_path, mylog, \
     parse_prng, parse_value, line_width_equiv
 from soxs.constants import erg_per_keV, hc, \
     sigma_to_fwhm, sqrt2pi
 import astropy.units as u
 import h5py
-from scipy.interpolate import InterpolatedUnivariateSpline
-from astropy.modeling.functional_models import \
-    Gaussian1D
+from scipy.interpolate import PPoly, splrep
 from soxs.apec import ApecGenerator
+from soxs.lib import sample_cdf
 
 
 class Energies(u.Quantity):
     def __new__(cls, energy, flux):
-        ret = u.Quantity.__new__(cls, energy, unit="keV")
-        ret.flux = u.Quantity(flux, "erg/(cm**2*s)")
+        # The energies are freshly drawn arrays, so they are wrapped
+        # without a copy, and the parsed flux unit is reused
+        ret = u.Quantity.__new__(cls, energy, unit=u.keV,
+                                 copy=not isinstance(energy, np.ndarray))
+        ret.flux = u.Quantity(flux, _get_unit("erg/(cm**2*s)"))
         return ret
 
 
 def _generate_energies(spec, t_exp, rate, prng, quiet=False):
-    cumspec = spec.cumspec
     n_ph = prng.poisson(t_exp*rate)
     if not quiet:
         mylog.info("Creating %d energies from this spectrum." % n_ph)
-    randvec = prng.uniform(size=n_ph)
+    randvec = prng.random(n_ph)
+    # The energies come out sorted. Callers such as detect_events_phlist
+    # pick photons by position, so the order is part of what a seed
+    # reproduces.
     randvec.sort()
-    e = np.interp(randvec, cumspec, spec.ebins.value)
+    e = spec._sample_energies(randvec)
     if not quiet:
         mylog.info("Finished creating energies.")
     return e
 
 
+def _sum_interpolated_area(arf, energy, chunk=1 << 20):
+    # Only the sum of the effective area at the photon energies is
+    # needed, so it is taken a chunk at a time instead of holding an
+    # area array as long as the photon list
+    return np.sum([arf._interpolate_area_raw(energy[i:i+chunk]).sum()
+                   for i in range(0, energy.size, chunk)])
+
+
+class _EnergySampler:
+    """
+    Draws energies from the CDF of a spectrum. It is set up once
+    per spectrum and reused until the flux of the spectrum changes.
+    """
+    def __init__(self, ebins, cdf):
+        self.ebins = np.asarray(ebins, dtype="float64")
+        self.cdf = cdf
+        # Guide table for inverting the CDF: for each of the
+        # equal-probability buckets, store the last CDF entry below it
+        # and the first CDF entry above it. The bucket edges are padded
+        # by a few ulps so that rounding in randvec*size can never put
+        # a number outside of its bucket.
+        edges = np.linspace(0.0, 1.0, 8*(cdf.size-1)+1)
+        eps = 4.0*np.finfo(cdf.dtype).eps
+        lo = np.searchsorted(cdf, edges[:-1]*(1.0-eps), side="right")-1
+        hi = np.searchsorted(cdf, edges[1:]*(1.0+eps), side="right")
+        self.guide_lo = lo
+        self.guide_hi = np.minimum(hi, cdf.size-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.slope = np.diff(self.ebins)/np.diff(cdf)
+
+    def sample(self, randvec, out=None):
+        return sample_cdf(randvec, self.cdf, self.ebins, self.slope,
+                          self.guide_lo, self.guide_hi, out=out)
+
+
+_unit_cache = {}
+
+
+def _get_unit(units):
+    # Parsing a unit string is slow, so only do it once per string
+    unit = _unit_cache.get(units)
+    if unit is None:
+        unit = _unit_cache[units] = u.Unit(units)
+    return unit
+
+
 class Spectrum:
     _units = "photon/(cm**2*s*keV)"
 
     def __init__(self, ebins, flux):
-        self.ebins = u.Quantity(ebins, "keV")
-        self.emid = 0.5*(self.ebins[1:]+self.ebins[:-1])
-        self.flux = u.Quantity(flux, self._units)
-        self.nbins = len(self.emid)
-        self.de = np.diff(self.ebins)
+        # The spectrum is stored as raw arrays in keV and self._units,
+        # the Quantity versions are only made when they are asked for
+        self._ebins = u.Quantity(ebins, u.keV).value
+        self._emid = 0.5*(self._ebins[1:]+self._ebins[:-1])
+        self._emid_erg = self._emid*erg_per_keV
+        self._flux = u.Quantity(flux, _get_unit(self._units)).value
+        self.nbins = len(self._emid)
+        self._de = np.diff(self._ebins)
+        self._scratch = np.empty(self.nbins)
         self._compute_total_flux()
 
+    @property
+    def ebins(self):
+        return u.Quantity(self._ebins, u.keV, copy=False)
+
+    @property
+    def emid(self):
+        return u.Quantity(self._emid, u.keV, copy=False)
+
+    @property
+    def de(self):
+        return u.Quantity(self._de, u.keV, copy=False)
+
+    @property
+    def flux(self):
+        return u.Quantity(self._flux, _get_unit(self._units), copy=False)
+
+    @flux.setter
+    def flux(self, flux):
+        if isinstance(flux, u.Quantity):
+            self._flux = flux.to_value(_get_unit(self._units))
+        else:
+            self._flux = u.Quantity(flux, _get_unit(self._units)).value
+
+    def _get_flux_units(self):
+        # The units of the photon and energy fluxes integrated over energy
+        units = _unit_cache.get((self._units, "integrated"))
+        if units is None:
+            unit = _get_unit(self._units)*u.keV
+            units = (unit, unit*u.erg/u.photon)
+            _unit_cache[self._units, "integrated"] = units
+        return units
+
+    def _compute_totals(self):
+        # Do the sums on the raw arrays and only attach units to the
+        # results, since Quantity arithmetic is much slower
+        photon_unit, energy_unit = self._get_flux_units()
+        # The per-bin products go into a scratch array kept on the
+        # spectrum, so that repeated updates (e.g. adding many lines)
+        # do not allocate them each time. The photon flux per bin is
+        # left in it for the caller.
+        if self._scratch.size != self._flux.size:
+            self._scratch = np.empty(self._flux.size)
+        efd = np.multiply(self._flux, self._emid_erg, out=self._scratch)
+        efd *= self._de
+        self.total_energy_flux = u.Quantity(efd.sum(), energy_unit)
+        fd = np.multiply(self._flux, self._de, out=self._scratch)
+        self.total_flux = u.Quantity(fd.sum(), photon_unit)
+        return fd
+
     def _compute_total_flux(self):
-        self.total_flux = (self.flux*self.de).sum()
-        self.total_energy_flux = (self.flux*self.emid.to("erg")*self.de).sum()/(1.0*u.photon)
-        cumspec = np.cumsum((self.flux*self.de).value)
-        cumspec = np.insert(cumspec, 0, 0.0)
+        fd = self._compute_totals()
+        # The CDF is handed out as self.cumspec, so it gets a fresh array
+        cumspec = np.empty(fd.size+1)
+        cumspec[0] = 0.0
+        np.cumsum(fd, out=cumspec[1:])
         cumspec /= cumspec[-1]
         self.cumspec = cumspec
-        self.func = lambda e: np.interp(e, self.emid.value, self.flux.value)
+        self._sampler = None
+
+    def _get_sampler(self):
+        if self._sampler is None:
+            self._sampler = _EnergySampler(self._ebins, self.cumspec)
+        return self._sampler
+
+    def _sample_energies(self, randvec):
+        # Setting up the sampler costs about as much as searching the
+        # CDF directly for a few photons per bin, so small draws from a
+        # spectrum without a sampler yet skip it. The sampler writes the
+        # energies over randvec, which is not needed afterwards, so no
+        # second photon-sized array is allocated.
+        if self._sampler is None and randvec.size < 2*self.nbins:
+            return np.interp(randvec, self.cumspec, self._ebins)
+        return self._get_sampler().sample(randvec, out=randvec)
 
     def _check_binning_units(self, other):
         if self.nbins != other.nbins or \
-                not np.isclose(self.ebins.value, other.ebins.value).all():
+                not np.isclose(self._ebins, other._ebins).all():
             raise RuntimeError("Energy binning for these two "
                                "spectra is not the same!!")
         if self._units != other._units:
@@ -66,27 +186,27 @@ class Spectrum:
 
     def __add__(self, other):
         self._check_binning_units(other)
-        return type(self)(self.ebins, self.flux+other.flux)
+        return type(self)(self._ebins, self._flux+other._flux)
 
     def __iadd__(self, other):
         self._check_binning_units(other)
-        self.flux += other.flux
+        self._flux += other._flux
         return self
 
     def __sub__(self, other):
         self._check_binning_units(other)
-        return type(self)(self.ebins, self.flux-other.flux)
+        return type(self)(self._ebins, self._flux-other._flux)
 
     def __mul__(self, other):
         if hasattr(other, "eff_area"):
             return ConvolvedSpectrum.convolve(self, other)
         else:
-            return type(self)(self.ebins, other*self.flux)
+            return type(self)(self._ebins, other*self.flux)
 
     __rmul__ = __mul__
 
     def __truediv__(self, other):
-        return type(self)(self.ebins, self.flux/other)
+        return type(self)(self._ebins, self.flux/other)
 
     __div__ = __truediv__
 
@@ -95,20 +215,25 @@ class Spectrum:
         s += f"    Total Flux:\n    {self.total_flux}\n    {self.total_energy_flux}\n"
         return s
 
+    def func(self, e):
+        return np.interp(e, self._emid, self._flux)
+
     def __call__(self, e):
         if hasattr(e, "to_astropy"):
             e = e.to_astropy()
         if isinstance(e, u.Quantity):
-            e = e.to("keV").value
-        return u.Quantity(self.func(e), self._units)
+            e = e.to_value(u.keV)
+        return u.Quantity(self.func(e), _get_unit(self._units))
 
     def restrict_within_band(self, emin=None, emax=None):
+        # emid is sorted, so the bins outside the band are just the
+        # slices below and above a pair of indices
         if emin is not None:
             emin = parse_value(emin, "keV")
-            self.flux[self.emid.value < emin] = 0.0
+            self._flux[:np.searchsorted(self._emid, emin, side="left")] = 0.0
         if emax is not None:
             emax = parse_value(emax, "keV")
-            self.flux[self.emid.value > emax] = 0.0
+            self._flux[np.searchsorted(self._emid, emax, side="right"):] = 0.0
         self._compute_total_flux()
 
     def get_flux_in_band(self, emin, emax):
@@ -131,10 +256,11 @@ class Spectrum:
         """
         emin = parse_value(emin, "keV")
         emax = parse_value(emax, "keV")
-        range = np.logical_and(self.emid.value >= emin, self.emid.value <= emax)
-        pflux = (self.flux*self.de)[range].sum()
-        eflux = (self.flux*self.emid.to("erg")*self.de)[range].sum()/(1.0*u.photon)
-        return pflux, eflux
+        range = np.logical_and(self._emid >= emin, self._emid <= emax)
+        photon_unit, energy_unit = self._get_flux_units()
+        pflux = (self._flux*self._de)[range].sum()
+        eflux = (self._flux*self._emid_erg*self._de)[range].sum()
+        return u.Quantity(pflux, photon_unit), u.Quantity(eflux, energy_unit)
 
     @classmethod
     def from_xspec_script(cls, infile, emin, emax, nbins):
@@ -239,8 +365,14 @@ class Spectrum:
         emin = parse_value(emin, 'keV')
         emax = parse_value(emax, 'keV')
         ebins = np.linspace(emin, emax, nbins+1)
-        emid = 0.5*(ebins[1:]+ebins[:-1])
-        flux = norm*(emid*(1.0+redshift))**(-photon_index)
+        # Build the flux in one array, starting from the bin centers
+        flux = np.add(ebins[1:], ebins[:-1])
+        flux *= 0.5
+        flux *= 1.0+redshift
+        np.power(flux, -photon_index, out=flux)
+        # The in-place multiply needs a bare number, so a Quantity
+        # normalization is converted to the units of the spectrum
+        flux *= parse_value(norm, cls._units)
         return cls(ebins, flux)
 
     @classmethod
@@ -275,7 +407,7 @@ class Spectrum:
                     arf = f.attrs["arf"]
         else:
             emid, flux = np.loadtxt(filename, unpack=True)
-            de = np.diff(emid)[0]
+            de = emid[1]-emid[0]
             ebins = np.append(emid-0.5*de, emid[-1]+0.5*de)
         if arf is not None:
             return cls(ebins, flux, arf)
@@ -303,17 +435,18 @@ class Spectrum:
         emin = parse_value(emin, "keV")
         emax = parse_value(emax, 'keV')
         ebins = np.linspace(emin, emax, nbins+1)
-        flux = const_flux*np.ones(nbins)
+        flux = np.full(nbins, parse_value(const_flux, cls._units),
+                       dtype="float64")
         return cls(ebins, flux)
 
     def _new_spec_from_band(self, emin, emax):
         emin = parse_value(emin, "keV")
         emax = parse_value(emax, 'keV')
-        band = np.logical_and(self.ebins.value >= emin,
-                              self.ebins.value <= emax)
+        band = np.logical_and(self._ebins >= emin,
+                              self._ebins <= emax)
         idxs = np.where(band)[0]
-        ebins = self.ebins.value[idxs]
-        flux = self.flux.value[idxs[:-1]]
+        ebins = self._ebins[idxs]
+        flux = self._flux[idxs[:-1]]
         return ebins, flux
 
     def new_spec_from_band(self, emin, emax):
@@ -355,18 +488,25 @@ class Spectrum:
                 "energy": erg/s/cm**2
         """
         if emin is None:
-            emin = self.ebins[0].value
+            emin = self._ebins[0]
         if emax is None:
-            emax = self.ebins[-1].value
+            emax = self._ebins[-1]
         emin = parse_value(emin, "keV")
         emax = parse_value(emax, 'keV')
-        idxs = np.logical_and(self.emid.value >= emin, self.emid.value <= emax)
+        idxs = np.logical_and(self._emid >= emin, self._emid <= emax)
         if flux_type == "photons":
-            f = (self.flux*self.de)[idxs].sum()
+            f = (self._flux*self._de)[idxs].sum()
         elif flux_type == "energy":
-            f = (self.flux*self.emid.to("erg")*self.de)[idxs].sum()
-        self.flux *= new_flux/f.value
-        self._compute_total_flux()
+            f = (self._flux*self._emid_erg*self._de)[idxs].sum()
+        self._scale_flux(new_flux/f)
+
+    def _scale_flux(self, factor):
+        # A change of normalization leaves the shape of the spectrum
+        # alone, so the CDF and the energy sampler built from it are
+        # kept. The totals are summed again rather than scaled, so they
+        # stay what _compute_total_flux would give for the new fluxes.
+        self._flux *= factor
+        self._compute_totals()
 
     def write_file(self, specfile, overwrite=False):
         """
@@ -401,9 +541,9 @@ class Spectrum:
         if os.path.exists(specfile) and not overwrite:
             raise IOError("File %s exists and overwrite=False!" % specfile)
         with h5py.File(specfile, "w") as f:
-            f.create_dataset("emin", data=self.ebins[0].value)
-            f.create_dataset("emax", data=self.ebins[-1].value)
-            f.create_dataset("spectrum", data=self.flux.value)
+            f.create_dataset("emin", data=self._ebins[0])
+            f.create_dataset("emax", data=self._ebins[-1])
+            f.create_dataset("spectrum", data=self._flux)
             if hasattr(self, "arf"):
                 f.attrs["arf"] = self.arf.filename
 
@@ -425,14 +565,23 @@ class Spectrum:
             The redshift of the absorbing material. Default: 0.0
         """
         nH = parse_value(nH, "1.0e22*cm**-2")
-        e = self.emid.value*(1.0+redshift)
+        e = self._emid*(1.0+redshift)
         if model == "wabs":
-            sigma = wabs_cross_section(e)
+            sigma = _cached_cross_section(wabs_cross_section, e)
         elif model == "tbabs":
-            sigma = tbabs_cross_section(e)
-        self.flux *= np.exp(-nH*1.0e22*sigma)
+            sigma = _cached_cross_section(tbabs_cross_section, e)
+        absorb = np.multiply(sigma, -nH*1.0e22)
+        np.exp(absorb, out=absorb)
+        self._flux *= absorb
         self._compute_total_flux()
 
+    def _line_window(self, line_center, sigma):
+        # Beyond 8 sigma a Gaussian line profile is down by more than a
+        # factor of 1e14 from its peak, so only the bins within this
+        # window need to be evaluated
+        return np.searchsorted(self._emid,
+                               [line_center-8.0*sigma, line_center+8.0*sigma])
+
     def add_emission_line(self, line_center, line_width, line_amp,
                           line_type="gaussian"):
         """
@@ -458,11 +607,18 @@ class Spectrum:
         if line_type == "gaussian":
             sigma = line_width / sigma_to_fwhm
             line_amp /= sqrt2pi * sigma
-            f = Gaussian1D(line_amp, line_center, sigma)
+            lo, hi = self._line_window(line_center, sigma)
+            x = self._emid[lo:hi]-line_center
+            x /= sigma
+            x *= x
+            x *= -0.5
+            profile = np.exp(x, out=x)
+            profile *= line_amp
         else:
             raise NotImplementedError("Line profile type '%s' " % line_type +
                                       "not implemented!")
-        self.flux += u.Quantity(f(self.emid.value), self._units)
+        flux = self._flux[lo:hi]
+        flux += profile
         self._compute_total_flux()
 
     def add_absorption_line(self, line_center, line_width, equiv_width, 
@@ -492,11 +648,18 @@ class Spectrum:
             sigma = line_width / sigma_to_fwhm
             B = equiv_width*line_center*line_center
             B /= hc * sqrt2pi * sigma
-            f = Gaussian1D(B, line_center, sigma)
+            lo, hi = self._line_window(line_center, sigma)
+            x = self._emid[lo:hi]-line_center
+            x /= sigma
+            x *= x
+            x *= -0.5
+            profile = np.exp(x, out=x)
+            profile *= -B
         else:
             raise NotImplementedError("Line profile type '%s' " % line_type +
                                       "not implemented!")
-        self.flux *= np.exp(-f(self.emid.value))
+        flux = self._flux[lo:hi]
+        flux *= np.exp(profile, out=profile)
         self._compute_total_flux()
 
     def generate_energies(self, t_exp, area, prng=None, quiet=False):
@@ -513,7 +676,7 @@ class Spectrum:
             events for a SIMPUT file, a constant should be 
             used and it must be large enough so that a 
             sufficiently large sample is drawn for the ARF.
-        prng : :class:`~numpy.random.RandomState` object, integer, or None
+        prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
             A pseudo-random number generator. Typically will only 
             be specified if you have a reason to generate the same 
             set of random numbers, such as for a test. Default is None, 
@@ -528,7 +691,7 @@ class Spectrum:
         prng = parse_prng(prng)
         rate = area*self.total_flux.value
         energy = _generate_energies(self, t_exp, rate, prng, quiet=quiet)
-        flux = np.sum(energy)*erg_per_keV/t_exp/area
+        flux = energy.sum()*(erg_per_keV/(t_exp*area))
         energies = Energies(energy, flux)
         return energies
 
@@ -599,17 +762,39 @@ class Spectrum:
         return fig, ax
 
 
+_wabs_emax = np.array([0.0, 0.1, 0.284, 0.4, 0.532, 0.707, 0.867, 1.303,
+                       1.840, 2.471, 3.210, 4.038, 7.111, 8.331, 10.0])
+_wabs_c0 = np.array([17.3, 34.6, 78.1, 71.4, 95.5, 308.9, 120.6, 141.3,
+                     202.7, 342.7, 352.2, 433.9, 629.0, 701.2])
+_wabs_c1 = np.array([608.1, 267.9, 18.8, 66.8, 145.8, -380.6, 169.3,
+                     146.8, 104.7, 18.7, 18.7, -2.4, 30.9, 25.2])
+_wabs_c2 = np.array([-2150., -476.1, 4.3, -51.4, -61.1, 294.0, -47.7,
+                     -31.5, -17.0, 0.0, 0.0, 0.75, 0.0, 0.0])
+
+
+_wabs_tables = (_wabs_emax.tolist(), _wabs_c0.tolist(),
+                _wabs_c1.tolist(), _wabs_c2.tolist())
+
+
 def wabs_cross_section(E):
-    emax = np.array([0.0, 0.1, 0.284, 0.4, 0.532, 0.707, 0.867, 1.303, 1.840, 
-                     2.471, 3.210, 4.038, 7.111, 8.331, 10.0])
-    c0 = np.array([17.3, 34.6, 78.1, 71.4, 95.5, 308.9, 120.6, 141.3,
-                   202.7,342.7,352.2,433.9,629.0,701.2])
-    c1 = np.array([608.1, 267.9, 18.8, 66.8, 145.8, -380.6, 169.3,
-                   146.8, 104.7, 18.7, 18.7, -2.4, 30.9, 25.2]) 
-    c2 = np.array([-2150., -476.1 ,4.3, -51.4, -61.1, 294.0, -47.7,
-                   -31.5, -17.0, 0.0, 0.0, 0.75, 0.0, 0.0])
-    idxs = np.minimum(np.searchsorted(emax, E)-1, 13)
-    sigma = (c0[idxs]+c1[idxs]*E+c2[idxs]*E*E)*1.0e-24/E**3
+    if isinstance(E, float) and E > 0.0:
+        # Single energies (e.g. when evaluating a model at one point)
+        # are done in plain floats, which skips the array machinery
+        # that dominates the cost for one value. Zero and negative
+        # energies are left to the array path, which gives inf rather
+        # than raising ZeroDivisionError.
+        emax, c0, c1, c2 = _wabs_tables
+        i = min(bisect_left(emax, E)-1, 13)
+        sigma = (c2[i]*E+c1[i])*E+c0[i]
+        return np.float64(sigma*1.0e-24/E**3)
+    idxs = np.minimum(np.searchsorted(_wabs_emax, E)-1, 13)
+    # Horner's rule, evaluated in place to avoid temporaries
+    sigma = _wabs_c2[idxs]*E
+    sigma += _wabs_c1[idxs]
+    sigma *= E
+    sigma += _wabs_c0[idxs]
+    sigma *= 1.0e-24
+    sigma /= E**3
     return sigma
 
 
@@ -620,14 +805,16 @@ def get_wabs_absorb(e, nH):
 
 _tbabs_emid = None
 _tbabs_sigma = None
-_tbabs_spline = None
+_tbabs_coeffs = None
+_tbabs_left = None
 
 
 def tbabs_cross_section(E):
     global _tbabs_emid
     global _tbabs_sigma
-    global _tbabs_spline
-    if _tbabs_spline is None:
+    global _tbabs_coeffs
+    global _tbabs_left
+    if _tbabs_coeffs is None:
         filename = os.path.join(soxs_files_path, "tbabs_table.h5")
         f = h5py.File(filename, "r")
         _tbabs_sigma = f["cross_section"][:]
@@ -635,10 +822,37 @@ def tbabs_cross_section(E):
         ebins = np.linspace(f["emin"][()], f["emax"][()], nbins+1)
         f.close()
         _tbabs_emid = 0.5*(ebins[1:]+ebins[:-1])
-        _tbabs_spline = InterpolatedUnivariateSpline(_tbabs_emid,
-                                                     _tbabs_sigma, k=5, 
-                                                     ext=1)
-    return _tbabs_spline(E)
+        tck = splrep(_tbabs_emid, _tbabs_sigma, k=5, s=0)
+        # Store the spline as one polynomial per knot interval. The
+        # interior knots are the uniformly spaced table energies, so
+        # the interval for an energy can be found directly instead of
+        # by the bisection FITPACK does for every point
+        pp = PPoly.from_spline(tck)
+        nonzero = np.diff(pp.x) > 0.0
+        _tbabs_coeffs = np.ascontiguousarray(pp.c[:, nonzero])
+        _tbabs_left = pp.x[:-1][nonzero]
+    E = np.asarray(E, dtype="float64")
+    de = _tbabs_emid[1]-_tbabs_emid[0]
+    # If the energies are a run of the table's own energies, the spline
+    # just reproduces the tabulated cross sections
+    if E.ndim == 1 and E.size > 0 and np.isfinite(E[0]):
+        i0 = int(np.rint((E[0]-_tbabs_emid[0])/de))
+        if 0 <= i0 <= _tbabs_emid.size-E.size and _tbabs_emid[i0] == E[0] \
+                and np.array_equal(E, _tbabs_emid[i0:i0+E.size]):
+            return _tbabs_sigma[i0:i0+E.size].copy()
+    # The first and last intervals span three table bins
+    # Non-finite energies land in an end interval once clipped; NaNs
+    # still come out as NaN and infinities are zeroed below
+    with np.errstate(invalid="ignore"):
+        idxs = np.floor((E-_tbabs_emid[0])/de).astype(np.intp)-2
+    idxs = np.clip(idxs, 0, _tbabs_left.size-1)
+    x = E-_tbabs_left[idxs]
+    sigma = _tbabs_coeffs[0][idxs]
+    for c in _tbabs_coeffs[1:]:
+        sigma *= x
+        sigma += c[idxs]
+    outside = (E < _tbabs_emid[0]) | (E > _tbabs_emid[-1])
+    return np.where(outside, 0.0, sigma)
 
 
 def get_tbabs_absorb(e, nH):
@@ -646,6 +860,23 @@ def get_tbabs_absorb(e, nH):
     return np.exp(-nH*1.0e22*sigma)
 
 
+_cross_section_cache = {}
+
+
+def _cached_cross_section(cross_section, e):
+    # Spectra are usually absorbed on the same energy grid over and over
+    # (e.g. a population of background sources), so remember the last
+    # cross section computed on a grid of each size and reuse it if the
+    # energies match exactly
+    key = (cross_section, e.size)
+    cached = _cross_section_cache.get(key)
+    if cached is not None and np.array_equal(cached[0], e):
+        return cached[1]
+    sigma = cross_section(e)
+    _cross_section_cache[key] = (e, sigma)
+    return sigma
+
+
 class CountRateSpectrum(Spectrum):
     _units = "photon/(s*keV)"
 
@@ -658,7 +889,7 @@ class CountRateSpectrum(Spectrum):
         ----------
         t_exp : float, (value, unit) tuple, or :class:`~astropy.units.Quantity`
             The exposure time in seconds.
-        prng : :class:`~numpy.random.RandomState` object, integer, or None
+        prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
             A pseudo-random number generator. Typically will only
             be specified if you have a reason to generate the same 
             set of random numbers, such as for a test. Default is None,
@@ -699,11 +930,11 @@ class ConvolvedSpectrum(CountRateSpectrum):
 
     def __add__(self, other):
         self._check_binning_units(other)
-        return ConvolvedSpectrum(self.ebins, self.flux+other.flux, self.arf)
+        return ConvolvedSpectrum(self._ebins, self._flux+other._flux, self.arf)
 
     def __sub__(self, other):
         self._check_binning_units(other)
-        return ConvolvedSpectrum(self.ebins, self.flux-other.flux, self.arf)
+        return ConvolvedSpectrum(self._ebins, self._flux-other._flux, self.arf)
 
     @classmethod
     def convolve(cls, spectrum, arf):
@@ -721,8 +952,8 @@ class ConvolvedSpectrum(CountRateSpectrum):
         from soxs.response import AuxiliaryResponseFile
         if not isinstance(arf, AuxiliaryResponseFile):
             arf = AuxiliaryResponseFile(arf)
-        earea = arf.interpolate_area(spectrum.emid.value)
-        rate = spectrum.flux * earea
+        earea = arf._interpolate_area_on_grid(spectrum._emid)
+        rate = spectrum.flux * u.Quantity(earea, "cm**2", copy=False)
         return cls(spectrum.ebins, rate, arf)
 
     def new_spec_from_band(self, emin, emax):
@@ -746,10 +977,9 @@ class ConvolvedSpectrum(CountRateSpectrum):
         Return the deconvolved :class:`~soxs.spectra.Spectrum`
         object associated with this convolved spectrum.
         """
-        earea = self.arf.interpolate_area(self.emid)
-        flux = self.flux / earea
-        flux = np.nan_to_num(flux.value)
-        return Spectrum(self.ebins.value, flux)
+        earea = self.arf._interpolate_area_on_grid(self._emid)
+        flux = np.nan_to_num(self._flux / earea)
+        return Spectrum(self._ebins, flux)
 
     def generate_energies(self, t_exp, prng=None, quiet=False):
         """
@@ -760,7 +990,7 @@ class ConvolvedSpectrum(CountRateSpectrum):
         ----------
         t_exp : float, (value, unit) tuple, or :class:`~astropy.units.Quantity`
             The exposure time in seconds.
-        prng : :class:`~numpy.random.RandomState` object, integer, or None
+        prng : :class:`~numpy.random.RandomState` or :class:`~numpy.random.Generator` object, integer, or None
             A pseudo-random number generator. Typically will only 
             be specified if you have a reason to generate the same 
             set of random numbers, such as for a test. Default is None, 
@@ -774,8 +1004,8 @@ class ConvolvedSpectrum(CountRateSpectrum):
         prng = parse_prng(prng)
         rate = self.total_flux.value
         energy = _generate_energies(self, t_exp, rate, prng, quiet=quiet)
-        earea = self.arf.interpolate_area(energy).value
-        flux = np.sum(energy)*erg_per_keV/t_exp/earea.sum()
+        earea_sum = _sum_interpolated_area(self.arf, energy)
+        flux = energy.sum()*(erg_per_keV/(t_exp*earea_sum))
         energies = Energies(energy, flux)
         return energies
 
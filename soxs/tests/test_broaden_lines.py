@@ -0,0 +1,51 @@
+import numpy as np
+from numpy.random import RandomState
+from numpy.testing import assert_allclose
+from soxs.lib import broaden_lines
+from soxs.lib.broaden_lines_python import \
+    broaden_lines as broaden_lines_python
+
+
+def test_broaden_lines():
+    prng = RandomState(24)
+    ebins = np.linspace(0.05, 12.0, 5001)
+    E0 = prng.uniform(0.1, 11.0, size=500)
+    sigma = E0*prng.uniform(1.0e-4, 2.0e-3, size=500)
+    amp = 10**prng.uniform(-8.0, 0.0, size=500)
+    vec = broaden_lines_python(E0, sigma, amp, ebins)
+    assert_allclose(vec.sum(), amp.sum())
+    assert_allclose(broaden_lines(E0, sigma, amp, ebins), vec,
+                    rtol=1.0e-6, atol=1.0e-15*vec.max())
+    vec32 = broaden_lines(E0.astype("float32"), sigma.astype("float32"),
+                          amp.astype("float32"), ebins.astype("float32"))
+    assert vec32.dtype == np.float32
+    assert_allclose(vec32, vec, rtol=1.0e-3, atol=1.0e-3*vec.max())
+    # Lines at and beyond the edges of the energy grid
+    E0 = np.array([0.05, 0.0501, 11.9999, 12.0, 12.01, 20.0])
+    sigma = np.full(E0.size, 0.01)
+    amp = np.ones(E0.size)
+    assert_allclose(broaden_lines(E0, sigma, amp, ebins),
+                    broaden_lines_python(E0, sigma, amp, ebins),
+                    rtol=1.0e-6, atol=1.0e-15)
+
+    # Strided arrays and arrays of mixed types
+    E0 = np.linspace(0.1, 11.0, 200)
+    sigma = 1.0e-3*E0
+    amp = np.ones(E0.size, dtype="float32")
+    assert_allclose(broaden_lines(E0[::2], sigma[::2], amp[::2], ebins),
+                    broaden_lines_python(E0[::2], sigma[::2],
+                                         amp[::2].astype("float64"), ebins),
+                    rtol=1.0e-6, atol=1.0e-15)
+
+
+def test_broaden_lines_module():
+    # soxs.lib.broaden_lines is still importable as a module
+    from soxs.lib.broaden_lines import broaden_lines as func
+    assert func is broaden_lines
+
+
+def test_broaden_lines_compiled():
+    # The extensions are optional, so check that a compiled build was
+    # picked and the tests are not checking the fallback against itself
+    assert broaden_lines.__module__.startswith("soxs.lib.broaden_lines_")
+    assert broaden_lines.__module__ != "soxs.lib.broaden_lines_python"
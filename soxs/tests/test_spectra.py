@@ -1,9 +1,15 @@
-from soxs.spectra import Spectrum, ConvolvedSpectrum
-from soxs.response import AuxiliaryResponseFile
+from soxs.spectra import Spectrum, ConvolvedSpectrum, wabs_cross_section, \
+    tbabs_cross_section
+from soxs.response import AuxiliaryResponseFile, FlatResponse
 from numpy.testing import assert_allclose, assert_array_equal
 import os
 import tempfile
 import shutil
+import numpy as np
+import astropy.units as u
+import h5py
+from scipy.interpolate import InterpolatedUnivariateSpline
+from soxs.utils import soxs_files_path
 
 
 def test_arithmetic():
@@ -70,6 +76,93 @@ def test_rescale_flux():
     f = spec.get_flux_in_band(0.4, 1.0)[1]
     assert_allclose(1.0e-12, f.value)
 
+    spec2 = Spectrum(spec.ebins.value, spec.flux.value)
+    assert spec.total_flux == spec2.total_flux
+    assert spec.total_energy_flux == spec2.total_energy_flux
+
+
+def test_quantity_flux():
+    flux_unit = u.Unit("photon/(cm**2*s*keV)")
+    spec1 = Spectrum.from_constant(1.0e-3*flux_unit, 0.1, 10.0, 1000)
+    spec2 = Spectrum.from_constant(10.0*u.Unit("photon/(m**2*s*keV)"),
+                                   0.1, 10.0, 1000)
+    assert_allclose(spec1.flux.value, 1.0e-3)
+    assert_allclose(spec2.flux.value, 1.0e-3)
+    spec3 = Spectrum.from_powerlaw(2.0, 0.1, 1.0e-3*flux_unit,
+                                   0.1, 10.0, 1000)
+    spec4 = Spectrum.from_powerlaw(2.0, 0.1, 1.0e-3, 0.1, 10.0, 1000)
+    assert_allclose(spec3.flux.value, spec4.flux.value)
+
+
+def test_generator_prng():
+    spec = Spectrum.from_powerlaw(1.5, 0.0, 1.0e-3, 0.1, 10.0, 10000)
+    e1 = spec.generate_energies(1.0e4, 30.0, prng=np.random.default_rng(24))
+    e2 = spec.generate_energies(1.0e4, 30.0, prng=np.random.default_rng(24))
+    assert_array_equal(e1.value, e2.value)
+    assert e1.value.min() >= 0.1
+    assert e1.value.max() <= 10.0
+
+
+def test_wabs_scalar():
+    e = np.array([0.05, 0.1, 0.3, 1.303, 2.0, 7.5, 10.0, 12.0])
+    sigma = wabs_cross_section(e)
+    sigma_s = [wabs_cross_section(float(ee)) for ee in e]
+    assert_allclose(sigma, sigma_s, rtol=1.0e-14)
+    with np.errstate(divide="ignore"):
+        assert wabs_cross_section(0.0) == np.inf
+
+
+def test_tbabs_spline():
+    with h5py.File(os.path.join(soxs_files_path, "tbabs_table.h5"), "r") as f:
+        sigma = f["cross_section"][:]
+        ebins = np.linspace(f["emin"][()], f["emax"][()], sigma.size+1)
+    emid = 0.5*(ebins[1:]+ebins[:-1])
+    spline = InterpolatedUnivariateSpline(emid, sigma, k=5, ext=1)
+    prng = np.random.RandomState(33)
+    e = np.concatenate([prng.uniform(emid[0], emid[-1], size=100000),
+                        emid[::97], emid[:5], emid[-5:],
+                        [emid[0]-1.0e-3, emid[-1]+1.0e-3, 0.0, 1.0e3]])
+    assert_allclose(tbabs_cross_section(e), spline(e), rtol=1.0e-10,
+                    atol=1.0e-12*sigma.max())
+    assert_allclose(tbabs_cross_section(emid[10:2000]), spline(emid[10:2000]),
+                    rtol=1.0e-10, atol=1.0e-12*sigma.max())
+
+
+def test_tbabs_nonfinite():
+    assert_array_equal(tbabs_cross_section(np.array([np.inf])), 0.0)
+    sigma = tbabs_cross_section(np.array([np.nan, 1.0]))
+    assert np.isnan(sigma[0])
+    assert_allclose(sigma[1], tbabs_cross_section(np.array([1.0]))[0])
+
+
+def test_arf_uniform_interp():
+    prng = np.random.RandomState(25)
+    arf = FlatResponse(0.1, 10.0, 1.0, 1000)
+    arf.eff_area = prng.uniform(0.0, 1000.0, size=1000)
+    e = prng.uniform(0.05, 10.5, size=100000)
+    e[:1000] = arf.emid
+    earea = np.interp(e, arf.emid, arf.eff_area, left=0.0, right=0.0)
+    assert_allclose(arf.interpolate_area(e).value, earea, rtol=1.0e-12)
+    arf.eff_area = prng.uniform(0.0, 1000.0, size=1000)
+    earea = np.interp(e, arf.emid, arf.eff_area, left=0.0, right=0.0)
+    assert_allclose(arf.interpolate_area(e).value, earea, rtol=1.0e-12)
+    arf.eff_area[500:] = 0.0
+    earea = np.interp(e, arf.emid, arf.eff_area, left=0.0, right=0.0)
+    assert_allclose(arf.interpolate_area(e).value, earea, rtol=1.0e-12)
+
+
+def test_convolve_changed_arf():
+    spec = Spectrum.from_powerlaw(1.5, 0.0, 1.0e-3, 0.5, 5.0, 10000)
+    arf = FlatResponse(0.1, 10.0, 1000.0, 1000)
+    cspec1 = ConvolvedSpectrum.convolve(spec, arf)
+    assert_allclose(cspec1.flux.value, 1000.0*spec.flux.value)
+    arf.eff_area = arf.eff_area*2.0
+    cspec2 = ConvolvedSpectrum.convolve(spec, arf)
+    assert_allclose(cspec2.flux.value, 2.0*cspec1.flux.value)
+    arf.eff_area[:] = 500.0
+    cspec3 = ConvolvedSpectrum.convolve(spec, arf)
+    assert_allclose(cspec3.flux.value, 0.5*cspec1.flux.value)
+
 
 def test_convolved_spectra():
     arf = AuxiliaryResponseFile("xrs_hdxi_3x10.arf")
@@ -1,7 +1,8 @@
 import os
 import logging
 import numpy as np
-from numpy.random import RandomState
+from numpy.random import RandomState, Generator, SeedSequence, \
+    default_rng
 import astropy.units as u
 from astropy.units import Quantity
 import warnings
@@ -88,8 +89,13 @@ soxs_files_path = os.path.join(soxs_path, "files")
 
 
 def parse_prng(prng):
-    if isinstance(prng, RandomState):
+    if isinstance(prng, (RandomState, Generator)):
         return prng
+    elif prng is None or isinstance(prng, SeedSequence):
+        # Unseeded draws have no stream to stay compatible with, so
+        # they use a Generator, which is about ten times cheaper to
+        # create than a RandomState and faster to draw from
+        return default_rng(prng)
     else:
         return RandomState(prng)
 
@@ -137,6 +143,10 @@ def ensure_numpy_array(obj):
 
 
 def parse_value(value, default_units, equivalence=None):
+    if isinstance(value, (float, int)):
+        # A bare number is already in the default units, so skip
+        # building and converting a Quantity
+        return np.float64(value)
     if isinstance(value, str):
         v = value.split(",")
         if len(v) == 2: